@@ -0,0 +1,117 @@
+import atexit
+import multiprocessing
+import os
+import pickle
+from importlib import metadata
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Tuple
+
+_CACHE_DIR: Optional[Path] = None
+_TABLES: Dict[str, Dict[str, dict]] = {}
+_STAMPS: Dict[str, Hashable] = {}
+_MARKS: Dict[str, Dict[str, int]] = {}
+_LOADED_SIZES: Dict[str, int] = {}
+
+
+def _size(tables: Dict[str, dict]) -> int:
+    return sum(len(values) for values in tables.values())
+
+
+def package_versions(*packages: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    versions = []
+    for package in packages:
+        try:
+            versions.append((package, metadata.version(package)))
+        except metadata.PackageNotFoundError:
+            versions.append((package, None))
+    return tuple(versions)
+
+
+def register_tables(
+    name: str, *table_names: str, stamp: Hashable = None
+) -> Dict[str, dict]:
+    tables: Dict[str, dict] = {table: {} for table in table_names}
+    _TABLES[name] = tables
+    _STAMPS[name] = stamp
+    _MARKS[name] = {table: 0 for table in table_names}
+    _LOADED_SIZES[name] = 0
+    return tables
+
+
+def _load_stored_tables(path: Path, stamp: Hashable) -> Dict[str, dict]:
+    try:
+        with path.open("rb") as file:
+            stored = pickle.load(file)
+    except Exception:
+        return {}
+    if not isinstance(stored, dict) or stored.get("stamp") != stamp:
+        return {}
+    stored_tables = stored.get("tables")
+    if not isinstance(stored_tables, dict) or not all(
+        isinstance(values, dict) for values in stored_tables.values()
+    ):
+        return {}
+    return stored_tables
+
+
+def open_cache(cache_dir: Path) -> None:
+    global _CACHE_DIR
+    if _CACHE_DIR is None:
+        atexit.register(_save_all)
+    _CACHE_DIR = cache_dir
+    for name, tables in _TABLES.items():
+        path = cache_dir / f"{name}.pkl"
+        stored_tables = _load_stored_tables(path, _STAMPS[name])
+        for table, values in tables.items():
+            values.update(stored_tables.get(table) or {})
+        _MARKS[name] = {table: len(values) for table, values in tables.items()}
+        _LOADED_SIZES[name] = _size(tables)
+
+
+def take_new_entries() -> Dict[str, Dict[str, dict]]:
+    entries: Dict[str, Dict[str, dict]] = {}
+    for name, tables in _TABLES.items():
+        marks = _MARKS[name]
+        entries[name] = {}
+        for table, values in tables.items():
+            entries[name][table] = dict(islice(values.items(), marks[table], None))
+            marks[table] = len(values)
+    return entries
+
+
+def merge_entries(entries: Dict[str, Dict[str, dict]]) -> None:
+    for name, tables in entries.items():
+        if name not in _TABLES:
+            continue
+        marks = _MARKS[name]
+        for table, values in tables.items():
+            _TABLES[name][table].update(values)
+            marks[table] = len(_TABLES[name][table])
+
+
+def _save_all() -> None:
+    if _CACHE_DIR is None or multiprocessing.parent_process() is not None:
+        return
+    for name in _TABLES:
+        _save_tables(_CACHE_DIR, name)
+
+
+def _save_tables(cache_dir: Path, name: str) -> None:
+    tables = _TABLES[name]
+    if _size(tables) == _LOADED_SIZES[name]:
+        return
+    path = cache_dir / f"{name}.pkl"
+    tmp_path = cache_dir / f"{name}.{os.getpid()}.tmp"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as file:
+            pickle.dump(
+                {"stamp": _STAMPS[name], "tables": tables},
+                file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+    _LOADED_SIZES[name] = _size(tables)
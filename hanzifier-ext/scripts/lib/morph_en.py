@@ -1,11 +1,10 @@
-from functools import lru_cache
-from typing import Iterable, Set
+from typing import FrozenSet, Iterable, Set
 
 try:
-    from nltk.stem import WordNetLemmatizer
+    from nltk.corpus import wordnet
     import nltk
 except Exception:  # pragma: no cover - best effort import
-    WordNetLemmatizer = None
+    wordnet = None
     nltk = None
 
 try:
@@ -13,8 +12,7 @@ try:
 except Exception as exc:  # pragma: no cover - required dependency
     raise ImportError("lemminflect is required for English morphology") from exc
 
-
-_LEMMATIZER = WordNetLemmatizer() if WordNetLemmatizer else None
+from lib.morph_cache import package_versions, register_tables
 
 
 def _wordnet_available() -> bool:
@@ -27,27 +25,64 @@ def _wordnet_available() -> bool:
         return False
 
 
-@lru_cache(maxsize=100000)
-def lemmatize_variants(word: str) -> Set[str]:
-    if not _LEMMATIZER or not _wordnet_available():
-        return {word}
+_WORDNET_OK = wordnet is not None and _wordnet_available()
+_CACHE = register_tables(
+    "en",
+    "lemmas",
+    "inflections",
+    "lemma_inflections",
+    stamp=(package_versions("lemminflect", "nltk"), _WORDNET_OK),
+)
+_LEMMA_CACHE = _CACHE["lemmas"]
+_INFLECTION_CACHE = _CACHE["inflections"]
+_LEMMA_INFLECTION_CACHE = _CACHE["lemma_inflections"]
+
+
+def warm_up() -> None:
+    getAllInflections("test")
+    if _WORDNET_OK:
+        wordnet._morphy("test", "n")
+
+
+def lemmatize_variants(word: str) -> FrozenSet[str]:
+    cached = _LEMMA_CACHE.get(word)
+    if cached is not None:
+        return cached
+    if not _WORDNET_OK:
+        return frozenset((word,))
+    morphy = wordnet._morphy
     lemmas = {word}
     for pos in ("n", "v", "a", "r"):
-        lemma = _LEMMATIZER.lemmatize(word, pos=pos)
-        if lemma:
-            lemmas.add(lemma)
-    return lemmas
+        candidates = morphy(word, pos)
+        if candidates:
+            lemmas.add(min(candidates, key=len))
+    result = frozenset(lemmas)
+    _LEMMA_CACHE[word] = result
+    return result
+
+
+def _inflections_for_lemma(lemma: str) -> FrozenSet[str]:
+    cached = _LEMMA_INFLECTION_CACHE.get(lemma)
+    if cached is not None:
+        return cached
+    inflections = {lemma}
+    for forms in getAllInflections(lemma).values():
+        inflections.update(forms)
+    result = frozenset(inflections)
+    _LEMMA_INFLECTION_CACHE[lemma] = result
+    return result
 
 
-@lru_cache(maxsize=100000)
-def generate_inflections(word: str) -> Set[str]:
+def generate_inflections(word: str) -> FrozenSet[str]:
+    cached = _INFLECTION_CACHE.get(word)
+    if cached is not None:
+        return cached
     inflections: Set[str] = set()
     for lemma in lemmatize_variants(word):
-        inflections.add(lemma)
-        all_inflections = getAllInflections(lemma)
-        for forms in all_inflections.values():
-            inflections.update(forms)
-    return inflections
+        inflections |= _inflections_for_lemma(lemma)
+    result = frozenset(inflections)
+    _INFLECTION_CACHE[word] = result
+    return result
 
 
 def encode_suffix_variants(
@@ -57,12 +92,11 @@ def encode_suffix_variants(
     drop_non_prefix: bool = False,
 ) -> Set[str]:
     encoded: Set[str] = set()
+    add = encoded.add
+    lemma_len = len(lemma)
     for form in forms:
-        if form == lemma:
-            encoded.add(lemma)
-        elif form.startswith(lemma):
-            suffix = form[len(lemma) :]
-            encoded.add(f"{lemma}#{suffix}" if suffix else lemma)
+        if form.startswith(lemma):
+            add(f"{lemma}#{form[lemma_len:]}" if len(form) > lemma_len else lemma)
         elif not drop_non_prefix:
-            encoded.add(form)
+            add(form)
     return encoded
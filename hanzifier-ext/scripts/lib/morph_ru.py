@@ -1,35 +1,57 @@
-from functools import lru_cache
-from typing import Iterable, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, Set, Tuple
 
 try:
     import pymorphy2
 except Exception as exc:  # pragma: no cover - required dependency
     raise ImportError("pymorphy2 is required for Russian morphology") from exc
 
+from lib.morph_cache import package_versions, register_tables
+
 
 _MORPH = pymorphy2.MorphAnalyzer()
+_CACHE = register_tables(
+    "ru",
+    "lexemes",
+    stamp=package_versions("pymorphy2", "pymorphy2-dicts-ru"),
+)
+_LEXEME_CACHE = _CACHE["lexemes"]
+_LEMMA_CACHE: Dict[str, str] = {}
+_LEMMA_CACHE_LIMIT = 200000
+
+
+def warm_up() -> None:
+    _MORPH.parse("тест")
 
 
-@lru_cache(maxsize=200000)
 def get_lemma(word: str) -> str:
+    cached = _LEMMA_CACHE.get(word)
+    if cached is not None:
+        return cached
     parsed = _MORPH.parse(word)
-    if not parsed:
-        return word
-    return parsed[0].normal_form or word
+    lemma = (parsed[0].normal_form if parsed else word) or word
+    if len(_LEMMA_CACHE) >= _LEMMA_CACHE_LIMIT:
+        _LEMMA_CACHE.clear()
+    _LEMMA_CACHE[word] = lemma
+    return lemma
 
 
-@lru_cache(maxsize=200000)
-def generate_lexeme_forms(word: str) -> Tuple[str, Set[str]]:
+def generate_lexeme_forms(word: str) -> Tuple[str, FrozenSet[str]]:
+    cached = _LEXEME_CACHE.get(word)
+    if cached is not None:
+        return cached
     parsed = _MORPH.parse(word)
     if not parsed:
-        return word, {word}
-    best = parsed[0]
-    lemma = best.normal_form or word
-    forms = {lemma}
-    for form in best.lexeme:
-        if form.word:
-            forms.add(form.word)
-    return lemma, forms
+        result = (word, frozenset((word,)))
+    else:
+        best = parsed[0]
+        lemma = best.normal_form or word
+        forms = {lemma}
+        for form in best.lexeme:
+            if form.word:
+                forms.add(form.word)
+        result = (lemma, frozenset(forms))
+    _LEXEME_CACHE[word] = result
+    return result
 
 
 def encode_suffix_variants(
@@ -39,12 +61,11 @@ def encode_suffix_variants(
     drop_non_prefix: bool = False,
 ) -> Set[str]:
     encoded: Set[str] = set()
+    add = encoded.add
+    lemma_len = len(lemma)
     for form in forms:
-        if form == lemma:
-            encoded.add(lemma)
-        elif form.startswith(lemma):
-            suffix = form[len(lemma) :]
-            encoded.add(f"{lemma}#{suffix}" if suffix else lemma)
+        if form.startswith(lemma):
+            add(f"{lemma}#{form[lemma_len:]}" if len(form) > lemma_len else lemma)
         elif not drop_non_prefix:
-            encoded.add(form)
+            add(form)
     return encoded
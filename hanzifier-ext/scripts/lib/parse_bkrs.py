@@ -1,8 +1,12 @@
-import json
+import os
 import re
-from collections import defaultdict
-from glob import glob
-from typing import Dict, Iterable, List
+import sys
+from typing import Dict, List, Optional, Set
+
+try:
+    import orjson
+except Exception as exc:  # pragma: no cover - required dependency
+    raise ImportError("orjson is required for parsing BKRS term banks") from exc
 
 
 STOPWORDS_RU = {
@@ -41,44 +45,62 @@ STOPWORDS_RU = {
 _RU_WORD_RE = re.compile(r"[а-яё]+", re.IGNORECASE)
 
 
-def _dedupe_preserve(words: Iterable[str]) -> List[str]:
-    seen = set()
-    ordered: List[str] = []
-    for word in words:
-        if word in seen:
+def _extract_russian_words(
+    text: str,
+    words: Optional[List[str]] = None,
+    seen: Optional[Set[str]] = None,
+) -> List[str]:
+    if words is None:
+        words = []
+    if seen is None:
+        seen = set()
+    intern = sys.intern
+    stop = STOPWORDS_RU
+    seen_add = seen.add
+    words_append = words.append
+    for word in _RU_WORD_RE.findall(text.lower()):
+        if len(word) < 2 or word in stop or word in seen:
             continue
-        seen.add(word)
-        ordered.append(word)
-    return ordered
-
-
-def _extract_russian_words(text: str) -> List[str]:
-    words = [
-        match.group(0).lower()
-        for match in _RU_WORD_RE.finditer(text)
-        if match.group(0).lower() not in STOPWORDS_RU
-        and len(match.group(0)) > 1
-    ]
-    return _dedupe_preserve(words)
+        word = intern(word)
+        seen_add(word)
+        words_append(word)
+    return words
 
 
-def _iter_term_bank_files(bkrs_dir: str) -> Iterable[str]:
-    pattern = f"{bkrs_dir.rstrip('/')}/term_bank_*.json"
-    return sorted(glob(pattern))
+def _iter_term_bank_files(bkrs_dir: str) -> List[str]:
+    try:
+        with os.scandir(bkrs_dir) as entries:
+            names = [
+                entry.name
+                for entry in entries
+                if entry.name.startswith("term_bank_")
+                and entry.name.endswith(".json")
+                and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    names.sort()
+    return [os.path.join(bkrs_dir, name) for name in names]
 
 
 def parse_bkrs_definitions(bkrs_dir: str) -> Dict[str, List[str]]:
-    result: Dict[str, List[str]] = defaultdict(list)
+    result: Dict[str, List[str]] = {}
+    merge_seen: Dict[str, Set[str]] = {}
     for path in _iter_term_bank_files(bkrs_dir):
-        with open(path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        with open(path, "rb") as file:
+            data = orjson.loads(file.read())
         for entry in data:
             if not entry or len(entry) < 6:
                 continue
             hanzi = entry[0]
             definitions = entry[5] if isinstance(entry[5], list) else []
             for definition in definitions:
-                result[hanzi] = _dedupe_preserve(
-                    result[hanzi] + _extract_russian_words(definition)
-                )
+                existing = result.get(hanzi)
+                if existing is None:
+                    result[hanzi] = _extract_russian_words(definition)
+                else:
+                    seen = merge_seen.get(hanzi)
+                    if seen is None:
+                        seen = merge_seen[hanzi] = set(existing)
+                    _extract_russian_words(definition, existing, seen)
     return result
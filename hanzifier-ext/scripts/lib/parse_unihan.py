@@ -1,6 +1,7 @@
 import re
-from collections import defaultdict
-from typing import Dict, Iterable, List
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
 
 
 STOPWORDS_EN = {
@@ -28,39 +29,42 @@ STOPWORDS_EN = {
 
 
 _WORD_RE = re.compile(r"[a-z]+")
-_PAREN_RE = re.compile(r"\([^)]*\)")
-_BRACK_RE = re.compile(r"\[[^\]]*\]")
+_STRIP_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]")
 
 
-def _dedupe_preserve(words: Iterable[str]) -> List[str]:
-    seen = set()
-    ordered: List[str] = []
-    for word in words:
-        if word in seen:
+@lru_cache(maxsize=50000)
+def _extract_english_words(text: str) -> Tuple[str, ...]:
+    normalized = _STRIP_RE.sub(" ", text.lower())
+    intern = sys.intern
+    stop = STOPWORDS_EN
+    seen: Set[str] = set()
+    seen_add = seen.add
+    words: List[str] = []
+    words_append = words.append
+    for word in _WORD_RE.findall(normalized):
+        if len(word) < 2 or word in stop or word in seen:
             continue
-        seen.add(word)
-        ordered.append(word)
-    return ordered
+        word = intern(word)
+        seen_add(word)
+        words_append(word)
+    return tuple(words)
 
 
-def _extract_english_words(text: str) -> List[str]:
-    normalized = text.lower()
-    normalized = _PAREN_RE.sub(" ", normalized)
-    normalized = _BRACK_RE.sub(" ", normalized)
-    words = [
-        match.group(0)
-        for match in _WORD_RE.finditer(normalized)
-        if match.group(0) not in STOPWORDS_EN and len(match.group(0)) > 1
-    ]
-    return _dedupe_preserve(words)
+def extract_english_words(text: str) -> List[str]:
+    return list(_extract_english_words(text))
 
 
-def extract_english_words(text: str) -> List[str]:
-    return _extract_english_words(text)
+def _extend_unique(existing: List[str], seen: Set[str], words: Iterable[str]) -> None:
+    for word in words:
+        if word in seen:
+            continue
+        seen.add(word)
+        existing.append(word)
 
 
 def parse_unihan_definitions(path: str) -> Dict[str, List[str]]:
-    result: Dict[str, List[str]] = defaultdict(list)
+    result: Dict[str, List[str]] = {}
+    merge_seen: Dict[str, Set[str]] = {}
     with open(path, "r", encoding="utf-8") as file:
         for line in file:
             line = line.strip()
@@ -73,7 +77,13 @@ def parse_unihan_definitions(path: str) -> Dict[str, List[str]]:
                 continue
             hanzi = parts[1]
             definition = parts[3]
-            result[hanzi] = _dedupe_preserve(
-                result[hanzi] + _extract_english_words(definition)
-            )
+            words = _extract_english_words(definition)
+            existing = result.get(hanzi)
+            if existing is None:
+                result[hanzi] = list(words)
+            else:
+                seen = merge_seen.get(hanzi)
+                if seen is None:
+                    seen = merge_seen[hanzi] = set(existing)
+                _extend_unique(existing, seen, words)
     return result
@@ -1,33 +1,64 @@
 import argparse
 import csv
-import json
+import multiprocessing
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, Iterable, List, Set, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+import orjson
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 if str(SCRIPT_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
+from lib.morph_cache import merge_entries, open_cache, take_new_entries
 from lib.morph_en import (
     encode_suffix_variants as encode_en_suffixes,
     generate_inflections as generate_en_inflections,
     lemmatize_variants as en_lemmatize_variants,
+    warm_up as warm_up_en,
 )
 from lib.morph_ru import (
     encode_suffix_variants as encode_ru_suffixes,
     generate_lexeme_forms,
+    warm_up as warm_up_ru,
 )
 from lib.parse_bkrs import parse_bkrs_definitions
 from lib.parse_unihan import extract_english_words, parse_unihan_definitions
 
 
+_CYRILLIC_FIRST = frozenset(
+    "абвгдеёжзийклмнопрстуфхцчшщъыьэюяАБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
+)
+
+
+def _column_index(header: List[str], name: str) -> int:
+    return header.index(name) if name in header else -1
+
+
+def _cell(row: List[str], idx: int) -> str:
+    return row[idx] if 0 <= idx < len(row) else ""
+
+
+def _extend_unique(existing: List[str], seen: Set[str], words: Iterable[str]) -> None:
+    for word in words:
+        if word in seen:
+            continue
+        seen.add(word)
+        existing.append(word)
+
+
 def _load_frequency_list(path: Path) -> List[str]:
     hanzi_list: List[str] = []
-    with path.open("r", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
+    with path.open("r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        idx_hanzi = _column_index(header, "hanzi_sc")
         for row in reader:
-            hanzi = row.get("hanzi_sc")
+            hanzi = _cell(row, idx_hanzi)
             if hanzi:
                 hanzi_list.append(hanzi)
     return hanzi_list
@@ -35,18 +66,28 @@ def _load_frequency_list(path: Path) -> List[str]:
 
 def _load_frequency_english(path: Path) -> Dict[str, List[str]]:
     en_map: Dict[str, List[str]] = {}
-    with path.open("r", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
+    merge_seen: Dict[str, Set[str]] = {}
+    with path.open("r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        idx_hanzi = _column_index(header, "hanzi_sc")
+        idx_definition = _column_index(header, "cc_cedict_definitions")
         for row in reader:
-            hanzi = row.get("hanzi_sc")
-            definition = row.get("cc_cedict_definitions") or ""
+            hanzi = _cell(row, idx_hanzi)
+            definition = _cell(row, idx_definition)
             if not hanzi or not definition:
                 continue
             words = extract_english_words(definition)
             if not words:
                 continue
-            existing = en_map.get(hanzi, [])
-            en_map[hanzi] = _dedupe_preserve(existing + words)
+            existing = en_map.get(hanzi)
+            if existing is None:
+                en_map[hanzi] = words
+            else:
+                seen = merge_seen.get(hanzi)
+                if seen is None:
+                    seen = merge_seen[hanzi] = set(existing)
+                _extend_unique(existing, seen, words)
     return en_map
 
 
@@ -63,99 +104,153 @@ def _expand_russian_word(word: str) -> Set[str]:
     return encode_ru_suffixes(lemma, forms, drop_non_prefix=True)
 
 
-def _dedupe_preserve(words: Iterable[str]) -> List[str]:
-    seen = set()
-    ordered: List[str] = []
-    for word in words:
-        if word in seen:
-            continue
-        seen.add(word)
-        ordered.append(word)
-    return ordered
-
-
 def _select_roots(
     en_roots: List[str],
     ru_roots: List[str],
     max_roots: int = 3,
 ) -> List[Tuple[str, str]]:
-    combined = _dedupe_preserve(en_roots + ru_roots)
-    selected = combined[:max_roots]
-    tagged: List[Tuple[str, str]] = []
-    for word in selected:
-        lang = "ru" if any("а" <= ch.lower() <= "я" or ch.lower() == "ё" for ch in word) else "en"
-        tagged.append((word, lang))
-    return tagged
+    seen: Set[str] = set()
+    selected: List[str] = []
+    for roots in (en_roots, ru_roots):
+        for word in roots:
+            if len(selected) >= max_roots:
+                break
+            if word in seen:
+                continue
+            seen.add(word)
+            selected.append(word)
+    return [(word, "ru" if word[0] in _CYRILLIC_FIRST else "en") for word in selected]
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _expand_chunk(
+    expand: Callable[[str], Set[str]],
+    words: List[str],
+) -> Tuple[Dict[str, Set[str]], Dict[str, Dict[str, dict]]]:
+    expanded = {word: expand(word) for word in words}
+    return expanded, take_new_entries()
+
+
+def _expand_words(
+    words: Iterable[str],
+    expand: Callable[[str], Set[str]],
+    workers: int,
+) -> Dict[str, Set[str]]:
+    unique = list(dict.fromkeys(words))
+    if workers <= 1 or len(unique) < 2:
+        return {word: expand(word) for word in unique}
+    chunk_size = 64
+    ordered = sorted(unique)
+    chunks = [ordered[idx : idx + chunk_size] for idx in range(0, len(ordered), chunk_size)]
+    expanded: Dict[str, Set[str]] = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as executor:
+        for chunk_expanded, entries in executor.map(partial(_expand_chunk, expand), chunks):
+            expanded.update(chunk_expanded)
+            merge_entries(entries)
+    return expanded
 
 
 def _collect_meanings(
     hanzi_list: Iterable[str],
     en_map: Dict[str, List[str]],
     ru_map: Dict[str, List[str]],
-) -> List[Dict[str, List[str]]]:
-    dataset: List[Dict[str, List[str]]] = []
-    en_cache: Dict[str, Set[str]] = {}
-    ru_cache: Dict[str, Set[str]] = {}
+    workers: int = 1,
+) -> Iterator[Tuple[str, List[str]]]:
+    roots_by_hanzi = [
+        (hanzi, _select_roots(en_map.get(hanzi, []), ru_map.get(hanzi, [])))
+        for hanzi in hanzi_list
+    ]
+    en_words = [
+        word
+        for _, roots in roots_by_hanzi
+        for word, lang in roots
+        if lang == "en"
+    ]
+    ru_words = [
+        word
+        for _, roots in roots_by_hanzi
+        for word, lang in roots
+        if lang == "ru"
+    ]
+    if workers > 1:
+        warm_up_en()
+        warm_up_ru()
+    en_cache = _expand_words(en_words, _expand_english_word, workers)
+    ru_cache = _expand_words(ru_words, _expand_russian_word, workers)
 
-    for hanzi in hanzi_list:
+    for hanzi, selected_roots in roots_by_hanzi:
         meanings: List[str] = []
         seen_meanings: Set[str] = set()
-        selected_roots = _select_roots(
-            en_map.get(hanzi, []),
-            ru_map.get(hanzi, []),
-        )
         for word, lang in selected_roots:
-            if lang == "ru":
-                if word not in ru_cache:
-                    ru_cache[word] = _expand_russian_word(word)
-                variants = ru_cache[word]
-            else:
-                if word not in en_cache:
-                    en_cache[word] = _expand_english_word(word)
-                variants = en_cache[word]
+            variants = ru_cache[word] if lang == "ru" else en_cache[word]
             for variant in variants:
                 if variant in seen_meanings:
                     continue
                 seen_meanings.add(variant)
                 meanings.append(variant)
 
-        dataset.append(
-            {
-                "hanzi": hanzi,
-                "meanings": meanings,
-            }
+        yield hanzi, meanings
+
+
+def _iter_json_array(hanzis: List[str], meanings: List[List[str]]) -> Iterator[bytes]:
+    if not hanzis:
+        yield b"[]"
+        return
+    yield b"[\n"
+    for idx, (hanzi, items) in enumerate(zip(hanzis, meanings)):
+        entry = orjson.dumps(
+            {"hanzi": hanzi, "meanings": items},
+            option=orjson.OPT_INDENT_2,
         )
-    return dataset
+        yield (b",\n  " if idx else b"  ") + entry.replace(b"\n", b"\n  ")
+    yield b"\n]"
+
+
+def _write_json(path: Path, hanzis: List[str], meanings: List[List[str]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as file:
+        file.writelines(_iter_json_array(hanzis, meanings))
 
 
-def _write_json(path: Path, payload: object) -> None:
+def _write_jsonl(path: Path, hanzis: List[str], meanings: List[List[str]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as file:
-        json.dump(payload, file, ensure_ascii=False, indent=2)
+    with path.open("wb") as file:
+        for hanzi, items in zip(hanzis, meanings):
+            file.write(orjson.dumps({"hanzi": hanzi, "meanings": items}))
+            file.write(b"\n")
 
 
-def _write_lists(dataset: List[Dict[str, List[str]]], out_dir: Path) -> None:
+def _write_lists(hanzis: List[str], meanings: List[List[str]], out_dir: Path) -> None:
     chunk_size = 100
-    for idx in range(0, len(dataset), chunk_size):
-        chunk = dataset[idx : idx + chunk_size]
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+    payloads: List[bytes] = []
+    for idx in range(0, len(hanzis), chunk_size):
+        chunk_hanzis = hanzis[idx : idx + chunk_size]
+        chunk_meanings = meanings[idx : idx + chunk_size]
         list_number = idx // chunk_size + 1
-        filename = f"list_{list_number:03d}.json"
-        _write_json(out_dir / filename, chunk)
+        paths.append(out_dir / f"list_{list_number:03d}.json")
+        payloads.append(b"".join(_iter_json_array(chunk_hanzis, chunk_meanings)))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(Path.write_bytes, paths, payloads))
 
 
-def _summarize(dataset: List[Dict[str, List[str]]]) -> None:
-    total_hanzi = len(dataset)
-    total_meanings = sum(len(item["meanings"]) for item in dataset)
-    with_suffix = sum(
-        1 for item in dataset for meaning in item["meanings"] if "#" in meaning
-    )
+def _summarize(hanzis: List[str], meanings: List[List[str]]) -> None:
+    total_hanzi = len(hanzis)
+    total_meanings = sum(len(items) for items in meanings)
+    with_suffix = sum(1 for items in meanings for meaning in items if "#" in meaning)
     print(f"Hanzi count: {total_hanzi}")
     print(f"Total meanings: {total_meanings}")
     print(f"Meanings with suffix encoding: {with_suffix}")
     print("Sample entries:")
-    for item in dataset[:5]:
-        sample = ", ".join(item["meanings"][:10])
-        print(f"- {item['hanzi']}: {sample}")
+    for hanzi, items in zip(hanzis[:5], meanings[:5]):
+        sample = ", ".join(items[:10])
+        print(f"- {hanzi}: {sample}")
 
 
 def main() -> None:
@@ -173,7 +268,19 @@ def main() -> None:
         type=Path,
         help="Path to output directory (default: data/processed/).",
     )
+    parser.add_argument(
+        "--workers",
+        default=os.cpu_count() or 1,
+        type=int,
+        help="Processes used for word expansion (default: CPU count).",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Write hanzi-meanings.jsonl instead of hanzi-meanings.json.",
+    )
     args = parser.parse_args()
+    open_cache(args.data_dir / ".morph_cache")
 
     freq_path = args.data_dir / "hanzi-frequency.csv"
     unihan_path = args.data_dir / "unihan-kdefinition.txt"
@@ -183,13 +290,24 @@ def main() -> None:
     en_map = parse_unihan_definitions(str(unihan_path))
     freq_en_map = _load_frequency_english(freq_path)
     for hanzi, words in freq_en_map.items():
-        en_map[hanzi] = _dedupe_preserve(en_map.get(hanzi, []) + words)
+        existing = en_map.get(hanzi)
+        if existing is None:
+            en_map[hanzi] = words
+        else:
+            _extend_unique(existing, set(existing), words)
     ru_map = parse_bkrs_definitions(str(bkrs_dir))
 
-    dataset = _collect_meanings(hanzi_list, en_map, ru_map)
-    _write_json(args.output_dir / "hanzi-meanings.json", dataset)
-    _write_lists(dataset, args.output_dir / "lists")
-    _summarize(dataset)
+    hanzis: List[str] = []
+    meanings: List[List[str]] = []
+    for hanzi, items in _collect_meanings(hanzi_list, en_map, ru_map, args.workers):
+        hanzis.append(hanzi)
+        meanings.append(items)
+    if args.jsonl:
+        _write_jsonl(args.output_dir / "hanzi-meanings.jsonl", hanzis, meanings)
+    else:
+        _write_json(args.output_dir / "hanzi-meanings.json", hanzis, meanings)
+    _write_lists(hanzis, meanings, args.output_dir / "lists")
+    _summarize(hanzis, meanings)
 
 
 if __name__ == "__main__":